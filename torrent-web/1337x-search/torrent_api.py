@@ -1,25 +1,50 @@
 """
-FastAPI server for 1337x.to torrent searching.
-Gets Cloudflare cookies once, caches to file, reuses for requests.
+FastAPI server for 1337x torrent searching.
+Routes each request to the fastest healthy mirror, with per-mirror
+Cloudflare cookies fetched once, cached to file and reused for requests.
 Includes warmup endpoint for preloading cookies on app start.
 """
-from fastapi import FastAPI, HTTPException, Query, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Query, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Callable, Iterable, Iterator, Optional
 from botasaurus.browser import browser, Driver
 from botasaurus.soupify import soupify
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar, copy_context
+from html.parser import HTMLParser
+from http.cookiejar import DefaultCookiePolicy
+from itertools import chain
+from urllib.parse import urlparse
 import requests
+import asyncio
+import codecs
+import hmac
+import math
 import re
 import time
 import json
 import os
+import sys
 import threading
 import traceback
 import uvicorn
 from datetime import datetime
 
-app = FastAPI(title="1337x Torrent API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background workers alongside the server"""
+    threading.Thread(target=_probe_mirrors_loop, daemon=True).start()
+    threading.Thread(target=_cookie_maintenance_loop, daemon=True).start()
+    threading.Thread(target=_browse_refresh_loop, daemon=True).start()
+    yield
+
+
+app = FastAPI(title="1337x Torrent API", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -30,10 +55,69 @@ app.add_middleware(
 )
 
 # Constants
-COOKIE_TTL = 60 * 30  # 30 minutes
-COOKIE_CACHE_FILE = os.path.join(os.path.dirname(__file__), "cookie_cache.json")
+COOKIE_TTL = 60 * 30  # 30 minutes, assumed lifetime until one has been learned
+COOKIE_MIN_LIFETIME = 60 * 10  # floor for learned lifetimes, well above the refresh lead
+COOKIE_MAX_LIFETIME = 60 * 60 * 24  # stop observing retired cookies after a day
+COOKIE_REFRESH_LEAD = 60 * 2  # refresh this long before expected expiry (at most 10% of the lifetime)
+COOKIE_PROBE_INTERVAL = 60 * 5  # seconds between validity probes per cookie jar
+COOKIE_PROBE_PATH = "/"  # only the first chunk is read
+COOKIE_MAINTENANCE_INTERVAL = 30
+COOKIE_IDLE_TIMEOUT = 60 * 30  # don't refresh ahead for mirrors unused this long
+COOKIE_CACHE_DIR = os.path.dirname(os.path.abspath(__file__))
 ERROR_LOG_DIR = os.path.join(os.path.dirname(__file__), "error-logs")
 
+# Mirrors in order of preference (comma-separated LEET_MIRRORS overrides).
+# The first mirror is canonical: detail URLs handed to clients always use it,
+# so anything keyed on those URLs is shared no matter which mirror served them.
+MIRRORS = [
+    m.strip().rstrip("/")
+    for m in os.environ.get(
+        "LEET_MIRRORS",
+        "https://1337x.to,https://1337x.st,https://x1337x.ws,https://x1337x.eu",
+    ).split(",")
+    if m.strip()
+]
+CANONICAL_BASE = MIRRORS[0]
+MIRROR_LATENCY_WINDOW = 50  # latency samples kept per mirror for p90
+MIRROR_EWMA_ALPHA = 0.3  # weight of the newest sample in the smoothed latency
+MIRROR_DEFAULT_LATENCY = 2.0  # assumed latency (s) for mirrors with no samples yet
+MIRROR_FAILURE_THRESHOLD = 3  # consecutive failures before a mirror is benched
+MIRROR_COOLDOWN = 30  # first bench duration (s), doubles per further failure
+MIRROR_MAX_COOLDOWN = 60 * 10
+MIRROR_MAX_ATTEMPTS = 2  # mirrors tried per request before giving up
+MIRROR_PROBE_INTERVAL = 60  # seconds between background health probes
+HEDGE_DEFAULT_DELAY = 1.5  # hedge delay (s) until a mirror has enough samples
+HEDGE_MIN_SAMPLES = 5
+ADMISSION_MAX_CONCURRENT = 4  # upstream-bound requests running at once
+ADMISSION_MAX_QUEUE = 16  # requests allowed to wait for a slot
+ADMISSION_DEFAULT_DEADLINE = 45  # seconds, when the client sends no X-Deadline-Ms
+ADMISSION_DEFAULT_SERVICE_TIME = 3.0  # assumed seconds per request until measured
+DEBUG_TOKEN = os.environ.get("LEET_DEBUG_TOKEN", "")  # debug endpoints are off unless set
+PROFILE_MAX_SECONDS = 60
+STATUS_STREAM_KEEPALIVE = 15  # seconds between SSE keepalive comments
+
+# Listings scraped on a schedule for the Browse page, name -> upstream path
+BROWSE_LISTINGS = {
+    "top": "/top-100",
+    "top-movies": "/top-100-movies",
+    "top-tv": "/top-100-television",
+    "top-games": "/top-100-games",
+    "top-apps": "/top-100-applications",
+    "top-music": "/top-100-music",
+    "top-anime": "/top-100-anime",
+    "trending": "/trending",
+    "trending-movies": "/trending/d/movies/",
+    "trending-tv": "/trending/d/tv/",
+}
+BROWSE_SNAPSHOT_FILE = os.path.join(COOKIE_CACHE_DIR, "browse_snapshot.json")
+BROWSE_REFRESH_INTERVAL = 60 * 60  # seconds between listing refreshes
+BROWSE_RETRY_INTERVAL = 60 * 5  # retry sooner when a round was skipped or failed
+BROWSE_MAX_STALENESS = 60 * 60 * 6  # launch a browser for listings only once this stale
+BROWSE_STARTUP_DELAY = 10  # let warmup go first
+STREAM_CHUNK_SIZE = 16 * 1024  # bytes per read when streaming upstream pages
+# Only found on Cloudflare's interstitial; real pages can embed challenge-platform scripts
+CHALLENGE_MARKERS = ("cf-chl-", "<title>just a moment")
+
 # Ensure error log directory exists
 os.makedirs(ERROR_LOG_DIR, exist_ok=True)
 
@@ -51,29 +135,179 @@ def log_error(message: str, exception: Optional[Exception] = None):
     print(f"[1337x] Error logged to {log_file}")
 
 
-class CookieCache:
+class Trace:
+    """Accumulated span timings for one traced request"""
+
     def __init__(self):
+        self.spans: dict[str, float] = {}
+
+    def add(self, name: str, seconds: float):
+        self.spans[name] = self.spans.get(name, 0) + seconds
+
+    def server_timing(self) -> str:
+        return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.spans.items())
+
+
+# Set only for requests with tracing enabled; everything else pays one ContextVar lookup
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+
+
+@contextmanager
+def span(name: str):
+    """Time a block into the current request's trace, if it is being traced"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, time.perf_counter() - start)
+
+
+def debug_authorized(token: str) -> bool:
+    return bool(DEBUG_TOKEN) and hmac.compare_digest(token.encode(), DEBUG_TOKEN.encode())
+
+
+class TraceMiddleware:
+    """Trace requests sent with `X-Trace: 1` and a valid X-Debug-Token.
+
+    Span timings are returned in a Server-Timing header. Plain ASGI rather
+    than BaseHTTPMiddleware so untraced requests cost a header lookup.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not DEBUG_TOKEN:
+            return await self.app(scope, receive, send)
+        headers = dict(scope["headers"])
+        if b"x-trace" not in headers or not debug_authorized(headers.get(b"x-debug-token", b"").decode("latin-1")):
+            return await self.app(scope, receive, send)
+
+        trace = Trace()
+        token = _current_trace.set(trace)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                trace.add("total", time.perf_counter() - start)
+                timing = trace.server_timing()
+                print(f"[1337x] Trace {scope['path']}: {timing}")
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_trace.reset(token)
+
+
+app.add_middleware(TraceMiddleware)
+
+
+def _thread_cpu_ticks(native_id: Optional[int]) -> Optional[int]:
+    """utime + stime of a thread from /proc (Linux only)"""
+    try:
+        with open(f"/proc/self/task/{native_id}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return int(fields[11]) + int(fields[12])
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def sample_stacks(seconds: float, interval: float, mode: str = "wall") -> str:
+    """Sample every thread's Python stack for `seconds` and return collapsed stacks.
+
+    The output is the folded format read by flamegraph.pl and speedscope, one
+    `thread;outer;...;inner count` line per distinct stack. In "cpu" mode a
+    thread is only counted when its CPU time advanced since the last sample,
+    so threads blocked on I/O, locks or the browser subprocess drop out.
+    """
+    counts: Counter = Counter()
+    last_ticks: dict[int, Optional[int]] = {}
+    me = threading.get_ident()
+    deadline = time.monotonic() + seconds
+
+    while time.monotonic() < deadline:
+        threads = {t.ident: t for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            thread = threads.get(ident)
+            if mode == "cpu":
+                ticks = _thread_cpu_ticks(thread.native_id if thread else None)
+                previous = last_ticks.get(ident)
+                last_ticks[ident] = ticks
+                if ticks is not None and (previous is None or ticks == previous):
+                    continue
+
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            frames.append(thread.name if thread else f"thread-{ident}")
+            counts[";".join(reversed(frames))] += 1
+        time.sleep(interval)
+
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+
+_profile_lock = threading.Lock()
+
+
+class CookieCache:
+    """Cookies for one mirror, with an expiry taken from cf_clearance and learned from probes.
+
+    The effective lifetime is the cookie's own expiry or the learned lifetime,
+    whichever comes first. When cookies are replaced, the old jar is kept as
+    `retired` and probed until Cloudflare rejects it, which reveals the real
+    lifetime without any request ever being sent with dead cookies. Jars that
+    die before they are replaced are learned from when they get blocked.
+    """
+
+    def __init__(self, cache_file: str):
+        self.cache_file = cache_file
         self.cookies: dict = {}
         self.user_agent: str = ""
         self.fetched_at: float = 0
+        self.expires_at: float = 0  # cf_clearance expiry, 0 if unknown
+        self.learned_lifetime: Optional[float] = None
+        self.last_valid_at: float = 0  # last successful request or probe
+        self.last_probe_at: float = 0
+        self.last_used_at: float = 0
+        self.last_refresh_at: float = 0  # last refresh-ahead attempt
+        self.retired: Optional[dict] = None
         self._lock = threading.Lock()
         self._is_fetching = False
+        self._fetch_started_at: float = 0
+        self._expiry_announced: float = 0  # fetched_at of the jar last announced as expired
+        self._last_death: Optional[float] = None  # lifetime of the last jar blocked before expiry
         self._load_from_file()
     
     def _load_from_file(self):
         """Load cached cookies from file if available and not expired"""
         try:
-            if os.path.exists(COOKIE_CACHE_FILE):
-                with open(COOKIE_CACHE_FILE, "r") as f:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, "r") as f:
                     data = json.load(f)
+                    # Learned lifetime is worth keeping even if the cookies are stale
+                    learned = data.get("learned_lifetime")
+                    self.learned_lifetime = max(COOKIE_MIN_LIFETIME, learned) if learned else None
+                    self.cookies = data.get("cookies", {})
+                    self.user_agent = data.get("user_agent", "")
+                    self.fetched_at = data.get("fetched_at", 0)
+                    self.expires_at = data.get("expires_at", 0)
+                    self.last_valid_at = data.get("last_valid_at", 0)
                     # Check if cached data is still valid
-                    if time.time() - data.get("fetched_at", 0) < COOKIE_TTL:
-                        self.cookies = data.get("cookies", {})
-                        self.user_agent = data.get("user_agent", "")
-                        self.fetched_at = data.get("fetched_at", 0)
+                    if not self.is_expired():
                         print(f"[1337x] Loaded cookies from cache file (age: {int(time.time() - self.fetched_at)}s)")
                         return True
                     else:
+                        self.cookies = {}
                         print("[1337x] Cached cookies expired")
         except Exception as e:
             print(f"[1337x] Failed to load cookie cache: {e}")
@@ -82,43 +316,293 @@ class CookieCache:
     def _save_to_file(self):
         """Save cookies to file for persistence"""
         try:
-            with open(COOKIE_CACHE_FILE, "w") as f:
+            with open(self.cache_file, "w") as f:
                 json.dump({
                     "cookies": self.cookies,
                     "user_agent": self.user_agent,
-                    "fetched_at": self.fetched_at
+                    "fetched_at": self.fetched_at,
+                    "expires_at": self.expires_at,
+                    "learned_lifetime": self.learned_lifetime,
+                    "last_valid_at": self.last_valid_at
                 }, f)
             print(f"[1337x] Cookies saved to cache file")
         except Exception as e:
             print(f"[1337x] Failed to save cookie cache: {e}")
     
+    def lifetime(self) -> float:
+        return self.learned_lifetime or COOKIE_TTL
+    
+    def expiry(self) -> float:
+        """Timestamp at which the current cookies are expected to stop working"""
+        expiry = self.fetched_at + self.lifetime()
+        if self.expires_at:
+            expiry = min(expiry, self.expires_at)
+        return expiry
+    
     def is_expired(self) -> bool:
-        return time.time() - self.fetched_at > COOKIE_TTL
+        return time.time() > self.expiry()
+    
+    def refresh_lead(self) -> float:
+        return min(COOKIE_REFRESH_LEAD, self.lifetime() / 10)
+    
+    def is_expiring(self) -> bool:
+        return time.time() > self.expiry() - self.refresh_lead()
     
     def needs_refresh(self) -> bool:
         return not self.cookies or self.is_expired()
     
-    def update(self, cookies: dict, user_agent: str):
+    def update(self, cookies: dict, user_agent: str, expires_at: float = 0):
+        if self.cookies and not self.is_expired() and self.retired is None:
+            # Keep probing the old jar to find out how long it really lasts.
+            # A jar already under observation is kept until it yields its lifetime.
+            self.retired = {
+                "cookies": self.cookies,
+                "user_agent": self.user_agent,
+                "fetched_at": self.fetched_at,
+                "expires_at": self.expires_at,
+                "last_valid_at": self.last_valid_at or self.fetched_at,
+            }
         self.cookies = cookies
         self.user_agent = user_agent
         self.fetched_at = time.time()
+        self.expires_at = expires_at
+        self.last_valid_at = self.fetched_at
+        self._save_to_file()
+        print(f"[1337x] Cookies cached (expected lifetime: {int(self.expiry() - self.fetched_at)}s)")
+    
+    def learn_lifetime(self, observed: float):
+        """Fold an observed cookie lifetime into the estimate"""
+        observed = max(COOKIE_MIN_LIFETIME, observed)
+        if self.learned_lifetime is None:
+            self.learned_lifetime = observed
+        else:
+            self.learned_lifetime = (self.learned_lifetime + observed) / 2
+        print(f"[1337x] Observed cookie lifetime {int(observed)}s, now expecting {int(self.learned_lifetime)}s")
         self._save_to_file()
-        print(f"[1337x] Cookies cached (TTL: {COOKIE_TTL}s)")
+    
+    def mark_valid(self):
+        self.last_valid_at = time.time()
+    
+    def mark_blocked(self):
+        """Current cookies were rejected: force a refresh.
+
+        The block may not be expiry (rate limits, a revoked clearance), so one
+        early block doesn't shorten the estimate. Two in a row do, set to the
+        longer of the two. Cookies that outlived the estimate raise it at once.
+        """
+        if self.fetched_at:
+            lasted = max(COOKIE_MIN_LIFETIME, self.last_valid_at - self.fetched_at)
+            previous, self._last_death = self._last_death, lasted
+            if lasted > self.lifetime():
+                self._last_death = None
+                self.learned_lifetime = lasted
+                print(f"[1337x] Cookies lasted at least {int(lasted)}s, now expecting that")
+                self._save_to_file()
+            elif previous is not None and max(previous, lasted) < self.lifetime():
+                self.learned_lifetime = max(previous, lasted)
+                print(f"[1337x] Cookies blocked after {int(self.learned_lifetime)}s twice in a row, now expecting that")
+                self._last_death = None
+                self._save_to_file()
+        self.fetched_at = 0
     
     def get_status(self) -> dict:
         return {
             "valid": not self.needs_refresh(),
             "age_seconds": int(time.time() - self.fetched_at) if self.fetched_at else None,
-            "ttl_remaining": max(0, int(COOKIE_TTL - (time.time() - self.fetched_at))) if self.fetched_at else 0,
+            "ttl_remaining": max(0, int(self.expiry() - time.time())) if self.fetched_at else 0,
+            "learned_lifetime": int(self.learned_lifetime) if self.learned_lifetime else None,
             "is_fetching": self._is_fetching
         }
 
 
-cache = CookieCache()
-
-
 BROWSER_CF_TIMEOUT = 45  # seconds to wait for cf_clearance cookie
 BROWSER_PROCESS_TIMEOUT = 60  # seconds before killing the subprocess
+BROWSER_REFRESH_ESTIMATE = 20  # assumed seconds for a successful refresh until measured
+
+# Durations of recent successful cookie refreshes, for admission decisions
+_refresh_durations: deque = deque(maxlen=20)
+
+
+def expected_refresh_time() -> float:
+    """Median duration of recent successful cookie refreshes"""
+    if not _refresh_durations:
+        return BROWSER_REFRESH_ESTIMATE
+    samples = sorted(_refresh_durations)
+    return samples[len(samples) // 2]
+
+
+class Mirror:
+    """A 1337x mirror with its own cookie identity, session and latency/health score"""
+
+    def __init__(self, base_url: str, rank: int):
+        self.base_url = base_url
+        self.host = urlparse(base_url).netloc
+        self.rank = rank
+        self.cache = CookieCache(os.path.join(COOKIE_CACHE_DIR, f"cookie_cache_{self.host}.json"))
+        self.session = requests.Session()
+        # Worker threads share the session: cookies go on each request and the jar stays empty
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self.latencies: deque = deque(maxlen=MIRROR_LATENCY_WINDOW)
+        self.ewma: Optional[float] = None
+        self.consecutive_failures = 0
+        self.down_until: float = 0
+        self._lock = threading.Lock()
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self.latencies.append(latency)
+            if self.ewma is None:
+                self.ewma = latency
+            else:
+                self.ewma = MIRROR_EWMA_ALPHA * latency + (1 - MIRROR_EWMA_ALPHA) * self.ewma
+            self.consecutive_failures = 0
+            self.down_until = 0
+
+    def record_probe(self, latency: float):
+        """Fold a cookieless probe into the latency score without touching health.
+
+        A reachable homepage says nothing about whether real requests work,
+        so only request outcomes (or cooldown expiry) take a mirror off the bench.
+        """
+        with self._lock:
+            if self.ewma is None:
+                self.ewma = latency
+            else:
+                self.ewma = MIRROR_EWMA_ALPHA * latency + (1 - MIRROR_EWMA_ALPHA) * self.ewma
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= MIRROR_FAILURE_THRESHOLD:
+                cooldown = min(
+                    MIRROR_MAX_COOLDOWN,
+                    MIRROR_COOLDOWN * 2 ** (self.consecutive_failures - MIRROR_FAILURE_THRESHOLD),
+                )
+                self.down_until = time.time() + cooldown
+                print(f"[1337x] Mirror {self.host} benched for {cooldown}s after {self.consecutive_failures} failures")
+
+    def is_healthy(self) -> bool:
+        return time.time() >= self.down_until
+
+    def p90(self) -> Optional[float]:
+        """90th percentile latency, or None until there are enough samples"""
+        with self._lock:
+            samples = sorted(self.latencies)
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.9))]
+
+    def score(self) -> float:
+        """Lower is better: smoothed latency, penalised for recent failures.
+
+        A mirror without valid cookies costs a browser launch before it can
+        answer, so it only wins when no mirror with cookies is healthy.
+        """
+        latency = self.ewma if self.ewma is not None else MIRROR_DEFAULT_LATENCY
+        score = latency * (1 + self.consecutive_failures)
+        if self.cache.needs_refresh():
+            score += BROWSER_CF_TIMEOUT
+        return score + self.rank * 0.001
+
+    def get_status(self) -> dict:
+        p90 = self.p90()
+        return {
+            "host": self.host,
+            "healthy": self.is_healthy(),
+            "latency_ms": int(self.ewma * 1000) if self.ewma is not None else None,
+            "p90_ms": int(p90 * 1000) if p90 is not None else None,
+            "consecutive_failures": self.consecutive_failures,
+            "cookies": self.cache.get_status(),
+        }
+
+
+class MirrorPool:
+    def __init__(self, base_urls: list[str]):
+        self.mirrors = [Mirror(url, rank) for rank, url in enumerate(base_urls)]
+        self._by_host = {m.host: m for m in self.mirrors}
+
+    def ranked(self, exclude: tuple = ()) -> list[Mirror]:
+        """Healthy mirrors, best first"""
+        candidates = [m for m in self.mirrors if m not in exclude]
+        healthy = [m for m in candidates if m.is_healthy()]
+        if not healthy and candidates:
+            # Everything is benched - try whichever comes back first
+            healthy = [min(candidates, key=lambda m: m.down_until)]
+        return sorted(healthy, key=lambda m: m.score())
+
+    def best(self) -> Mirror:
+        return self.ranked()[0]
+
+    def to_path(self, url: str) -> Optional[str]:
+        """Strip a known mirror's origin from a URL, or None if it isn't a mirror URL"""
+        parsed = urlparse(url)
+        if parsed.scheme != "https" or parsed.netloc not in self._by_host:
+            return None
+        return (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+
+    def get_status(self) -> dict:
+        """Cookie status of the mirror requests currently route to, plus every mirror's score"""
+        best = self.best()
+        return {
+            **best.cache.get_status(),
+            "mirror": best.host,
+            "mirrors": [m.get_status() for m in self.mirrors],
+        }
+
+
+mirrors = MirrorPool(MIRRORS)
+
+
+class StatusBroadcaster:
+    """Fan out cookie state transitions to /api/status/stream subscribers.
+
+    Events are published from worker threads and handed to each subscriber's
+    event loop, so nothing polls.
+    """
+
+    def __init__(self):
+        self._subscribers: set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> tuple[asyncio.AbstractEventLoop, asyncio.Queue]:
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(maxsize=100))
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: tuple[asyncio.AbstractEventLoop, asyncio.Queue]):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, state: str, mirror: Mirror, **data):
+        """Send an event (fetching, attempt_failed, valid, failed, blocked, expired)"""
+        event = {"state": state, "host": mirror.host, **data, "status": overall_status()}
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._put, queue, event)
+            except RuntimeError:
+                self.unsubscribe((loop, queue))  # loop closed
+
+    @staticmethod
+    def _put(queue: asyncio.Queue, event: dict):
+        if queue.full():
+            queue.get_nowait()  # slow client: drop the oldest event
+        queue.put_nowait(event)
+
+
+status_events = StatusBroadcaster()
+
+
+def overall_status() -> dict:
+    """Cookie status of the mirror requests route to, without the per-mirror breakdown"""
+    status = mirrors.get_status()
+    status.pop("mirrors")
+    return status
 
 
 @browser(
@@ -126,17 +610,17 @@ BROWSER_PROCESS_TIMEOUT = 60  # seconds before killing the subprocess
     output=None,
     close_on_crash=True,
 )
-def _fetch_cookies_browser(driver: Driver, data=None) -> dict:
-    """Open browser, wait for Cloudflare challenge to auto-resolve, return cookies.
+def _fetch_cookies_browser(driver: Driver, data: str) -> dict:
+    """Open browser on the mirror in `data`, wait for Cloudflare challenge to auto-resolve, return cookies.
 
     Does NOT use google_get(bypass_cloudflare=True) because it hangs
     indefinitely after the page loads (known Botasaurus issue).
     Instead, navigates directly and waits for cf_clearance cookie to appear,
     which proves the JS challenge was solved by the browser engine.
     """
-    print("[1337x] Opening browser to get Cloudflare cookies...")
+    print(f"[1337x] Opening browser to get Cloudflare cookies for {data}...")
     try:
-        driver.get("https://1337x.to/search/test/1/")
+        driver.get(f"{data}/search/test/1/")
 
         # Wait for Cloudflare challenge to auto-resolve.
         # The browser engine executes the CF JS challenge automatically.
@@ -186,6 +670,9 @@ def _fetch_cookies_browser(driver: Driver, data=None) -> dict:
         # Extract final cookies and user agent
         all_cookies = driver.get_cookies()
         cookies = {c["name"]: c["value"] for c in all_cookies}
+        cf_cookie = next((c for c in all_cookies if c["name"] == "cf_clearance"), {})
+        # CDP reports "expires" (-1 for session cookies), WebDriver reports "expiry"
+        expires_at = max(0, cf_cookie.get("expires") or cf_cookie.get("expiry") or 0)
         user_agent = driver.run_js("return navigator.userAgent")
 
         if not cookies:
@@ -197,26 +684,22 @@ def _fetch_cookies_browser(driver: Driver, data=None) -> dict:
         if not has_cf:
             raise Exception("cf_clearance cookie not found — Cloudflare bypass failed")
 
-        return {"cookies": cookies, "user_agent": user_agent}
+        return {"cookies": cookies, "user_agent": user_agent, "expires_at": expires_at}
     except Exception as e:
         print(f"[1337x] Browser error: {e}")
         raise
 
 
-# Create a persistent session for better cookie handling
-_session = requests.Session()
-
-
-def _browser_subprocess_target(q):
+def _browser_subprocess_target(q, base_url):
     """Top-level target for multiprocessing (must be picklable)."""
     try:
-        result = _fetch_cookies_browser()
+        result = _fetch_cookies_browser(base_url)
         q.put({"ok": True, "result": result})
     except Exception as e:
         q.put({"ok": False, "error": str(e)})
 
 
-def _run_browser_in_subprocess() -> dict:
+def _run_browser_in_subprocess(base_url: str) -> dict:
     """Run browser cookie fetch in a subprocess with a hard kill timeout.
 
     Uses multiprocessing so we can actually terminate a hung browser,
@@ -226,7 +709,7 @@ def _run_browser_in_subprocess() -> dict:
 
     result_queue: mp.Queue = mp.Queue()
 
-    proc = mp.Process(target=_browser_subprocess_target, args=(result_queue,), daemon=True)
+    proc = mp.Process(target=_browser_subprocess_target, args=(result_queue, base_url), daemon=True)
     proc.start()
     proc.join(timeout=BROWSER_PROCESS_TIMEOUT)
 
@@ -250,15 +733,27 @@ def _run_browser_in_subprocess() -> dict:
     return msg["result"]
 
 
-def fetch_cookies_safe(max_retries: int = 2) -> bool:
+def fetch_cookies_safe(max_retries: int = 2, mirror: Optional[Mirror] = None, force: bool = False) -> bool:
     """Safely fetch cookies with lock, subprocess timeout, and retries.
 
     Args:
         max_retries: Number of full browser attempts before giving up.
+        mirror: Mirror to fetch cookies for (defaults to the best-ranked one).
+        force: Fetch even if the current cookies are still valid. They stay
+            in use until the new ones arrive.
     """
+    mirror = mirror or mirrors.best()
+    claimed = _claim_fetch(mirror.cache, force)
+    if claimed is not None:
+        return claimed
+    return _run_cookie_fetch(mirror, max_retries)
+
+
+def _claim_fetch(cache: CookieCache, force: bool = False) -> Optional[bool]:
+    """Mark a cookie fetch as started. Returns None if claimed, else fetch_cookies_safe's answer."""
     with cache._lock:
         # Double-check after acquiring lock
-        if not cache.needs_refresh():
+        if not force and not cache.needs_refresh():
             print("[1337x] Cookies already valid (checked after lock)")
             return True
 
@@ -268,48 +763,64 @@ def fetch_cookies_safe(max_retries: int = 2) -> bool:
             return False
 
         cache._is_fetching = True
+        cache._fetch_started_at = time.time()
+        return None
+
 
+def _run_cookie_fetch(mirror: Mirror, max_retries: int = 2) -> bool:
+    """Run browser attempts for a fetch already claimed with _claim_fetch"""
+    cache = mirror.cache
+    success = False
     try:
         for attempt in range(1, max_retries + 1):
             try:
-                print(f"[1337x] Cookie fetch attempt {attempt}/{max_retries}")
-                result = _run_browser_in_subprocess()
+                print(f"[1337x] Cookie fetch attempt {attempt}/{max_retries} ({mirror.host})")
+                status_events.publish("fetching", mirror, attempt=attempt, max_attempts=max_retries)
+                result = _run_browser_in_subprocess(mirror.base_url)
                 if result and isinstance(result, dict) and "cookies" in result and "user_agent" in result:
-                    cache.update(result["cookies"], result["user_agent"])
+                    cache.update(result["cookies"], result["user_agent"], result.get("expires_at", 0))
+                    _refresh_durations.append(time.time() - cache._fetch_started_at)
+                    success = True
                     return True
                 else:
                     raise Exception("Invalid result from browser function")
             except Exception as e:
                 log_error(f"Cookie fetch attempt {attempt}/{max_retries} failed", e)
                 print(f"[1337x] Attempt {attempt}/{max_retries} failed: {e}")
+                status_events.publish(
+                    "attempt_failed", mirror, attempt=attempt, max_attempts=max_retries, error=str(e)
+                )
                 if attempt < max_retries:
                     print("[1337x] Retrying in 2s...")
                     time.sleep(2)
 
         # All retries exhausted
         print(f"[1337x] All {max_retries} cookie fetch attempts failed")
-        cache.cookies = {}
-        cache.user_agent = ""
-        cache.fetched_at = 0
+        if cache.needs_refresh():
+            cache.cookies = {}
+            cache.user_agent = ""
+            cache.fetched_at = 0
         return False
     finally:
         with cache._lock:
             cache._is_fetching = False
+        # Published after clearing the flag so the attached status is final
+        status_events.publish("valid" if success else "failed", mirror)
 
 
-def ensure_cookies() -> bool:
-    """Ensure we have valid cookies, refresh if needed"""
-    if not cache.needs_refresh():
-        print("[1337x] Cookies already valid, no refresh needed")
+def ensure_cookies(mirror: Optional[Mirror] = None) -> bool:
+    """Ensure we have valid cookies for a mirror, refresh if needed"""
+    mirror = mirror or mirrors.best()
+    if not mirror.cache.needs_refresh():
         return True
-    print("[1337x] Cookies need refresh, calling fetch_cookies_safe")
-    return fetch_cookies_safe()
+    print(f"[1337x] Cookies for {mirror.host} need refresh, calling fetch_cookies_safe")
+    return fetch_cookies_safe(mirror=mirror)
 
 
-def get_browser_headers() -> dict:
+def get_browser_headers(user_agent: str) -> dict:
     """Get browser-like headers to reduce Cloudflare blocks"""
     return {
-        "User-Agent": cache.user_agent,
+        "User-Agent": user_agent,
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.9",
         "Accept-Encoding": "gzip, deflate, br",
@@ -323,80 +834,491 @@ def get_browser_headers() -> dict:
     }
 
 
-def fetch(url: str) -> str:
-    """Fetch URL using cached cookies and persistent session"""
-    if not ensure_cookies():
-        raise Exception("Failed to get Cloudflare cookies")
-    
-    # Update session cookies and headers
-    _session.cookies.clear()
-    _session.cookies.update(cache.cookies)
-    _session.headers.update(get_browser_headers())
-    
-    response = _session.get(url, timeout=30)
-    
-    # Check if blocked
-    is_blocked = response.status_code == 403 or (
-        response.status_code == 200 and 
-        "challenge" in response.text.lower() and 
-        len(response.text) < 10000  # Real pages are larger
+def _is_blocked(status_code: int, first_chunk: str) -> bool:
+    """Detect a Cloudflare block from the status and the first chunk of the body"""
+    if status_code == 403:
+        return True
+    if status_code != 200:
+        return False
+    head = first_chunk.lower()
+    return any(marker in head for marker in CHALLENGE_MARKERS) or (
+        "challenge" in head and len(first_chunk) < 10000  # Real pages are larger
     )
-    
-    if is_blocked:
-        print("[1337x] Blocked - forcing cookie refresh")
-        cache.fetched_at = 0  # Force refresh
-        if not ensure_cookies():
-            raise Exception("Failed to refresh cookies after block")
-        
-        # Update session with new cookies
-        _session.cookies.clear()
-        _session.cookies.update(cache.cookies)
-        
-        response = _session.get(url, timeout=30)
-    
-    return response.text
 
 
-def parse_search(html: str) -> list[dict]:
-    """Parse search results HTML"""
-    soup = soupify(html)
-    table = soup.select_one("table.table-list")
-    if not table:
-        return []
-    
-    torrents = []
-    for row in table.select("tbody tr"):
+def _stream_text(response: requests.Response) -> Iterator[str]:
+    """Decode a streamed response body chunk by chunk"""
+    content_type = response.headers.get("Content-Type", "").lower()
+    encoding = response.encoding if "charset" in content_type else "utf-8"
+    decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _open_stream(mirror: Mirror, path: str) -> tuple[requests.Response, Iterator[str], str]:
+    """Start a streamed GET and read just the first chunk"""
+    response = mirror.session.get(
+        mirror.url(path),
+        cookies=mirror.cache.cookies,
+        headers=get_browser_headers(mirror.cache.user_agent),
+        timeout=30,
+        stream=True,
+    )
+    chunks = _stream_text(response)
+    return response, chunks, next(chunks, "")
+
+
+def _timed_chunks(chunks: Iterator[str]) -> Iterator[str]:
+    """Pass chunks through, timing each read into the `fetch` span"""
+    while True:
+        with span("fetch"):
+            chunk = next(chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+class CookiesUnavailable(Exception):
+    """No usable cookies for a mirror (refresh failed or already in progress).
+
+    Not the mirror's fault, so it doesn't count against its health.
+    """
+
+
+def _fetch_from(
+    mirror: Mirror,
+    path: str,
+    consume: Callable[[Iterable[str]], Any] = "".join,
+    refresh_cookies: bool = True,
+    first_chunk: Optional[threading.Event] = None,
+) -> Any:
+    """Stream a path from one mirror into `consume`, refreshing cookies once if blocked.
+
+    `consume` receives the decoded body as an iterable of chunks and may stop
+    early; the connection is released as soon as it returns. With
+    refresh_cookies=False no browser is launched: missing or blocked cookies
+    raise CookiesUnavailable instead. `first_chunk` is set once the page
+    starts arriving, the point at which latency is measured.
+    """
+    with span("cookie_wait"):
+        cookies_ok = ensure_cookies(mirror) if refresh_cookies else not mirror.cache.needs_refresh()
+    if not cookies_ok:
+        raise CookiesUnavailable(f"Failed to get Cloudflare cookies for {mirror.host}")
+
+    mirror.cache.last_used_at = time.time()
+    response = None
+    start = time.time()
+    try:
+        with span("fetch"):
+            response, chunks, first = _open_stream(mirror, path)
+
+        if _is_blocked(response.status_code, first):
+            print(f"[1337x] Blocked on {mirror.host} - forcing cookie refresh")
+            response.close()
+            mirror.cache.mark_blocked()  # Force refresh
+            status_events.publish("blocked", mirror)
+            with span("cookie_wait"):
+                cookies_ok = refresh_cookies and ensure_cookies(mirror)
+            if not cookies_ok:
+                raise CookiesUnavailable(f"Failed to refresh cookies for {mirror.host} after block")
+
+            start = time.time()
+            with span("fetch"):
+                response, chunks, first = _open_stream(mirror, path)
+
+        if response.status_code >= 500:
+            raise Exception(f"{mirror.host} returned HTTP {response.status_code}")
+
+        latency = time.time() - start  # time to first chunk
+        if first_chunk is not None:
+            first_chunk.set()
+        # Only the network reads count as fetch; `consume` times its own parsing
+        result = consume(chain([first], _timed_chunks(chunks)))
+    except CookiesUnavailable:
+        raise
+    except Exception:
+        mirror.record_failure()
+        raise
+    finally:
+        if response is not None:
+            response.close()
+
+    mirror.record_success(latency)
+    mirror.cache.mark_valid()
+    return result
+
+
+_hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+
+
+def _fetch_hedged(path: str, consume: Callable[[Iterable[str]], Any]) -> Any:
+    """Fetch from the best mirror; if it hasn't started answering within its p90, race a second mirror"""
+    ranked = mirrors.ranked()
+    primary = ranked[0]
+    # Only hedge onto a mirror that already has cookies - a browser launch is never faster
+    backup = next((m for m in ranked[1:] if not m.cache.needs_refresh()), None)
+    if backup is None or primary.cache.needs_refresh():
+        return fetch(path, consume=consume)
+
+    delay = primary.p90() or HEDGE_DEFAULT_DELAY
+    # p90 is time to first chunk, so hedge on that rather than on the whole download
+    responded = threading.Event()
+    # copy_context() carries the request's trace into the hedge threads
+    first = _hedge_executor.submit(copy_context().run, _fetch_from, primary, path, consume, True, responded)
+    first.add_done_callback(lambda _: responded.set())  # a quick failure also ends the wait
+    if responded.wait(delay):
         try:
-            name_col = row.select_one("td.name")
-            if not name_col:
-                continue
-            
-            links = name_col.select("a")
-            link = links[1] if len(links) > 1 else links[0] if links else None
-            if not link:
-                continue
-            
-            seeds = row.select_one("td.seeds")
-            leeches = row.select_one("td.leeches")
-            size_col = row.select_one("td.size") or (row.select("td")[4] if len(row.select("td")) > 4 else None)
-            time_col = row.select_one("td.coll-date") or (row.select("td")[3] if len(row.select("td")) > 3 else None)
-            
-            size_text = size_col.get_text(strip=True) if size_col else "Unknown"
-            size_match = re.match(r'([\d.]+\s*[KMGT]?i?B)', size_text, re.I)
-            
-            torrents.append({
-                "title": link.get_text(strip=True),
-                "seeds": int(seeds.get_text(strip=True)) if seeds else 0,
-                "peers": int(leeches.get_text(strip=True)) if leeches else 0,
-                "size": size_match.group(1) if size_match else size_text,
-                "time": time_col.get_text(strip=True) if time_col else "",
-                "desc": "https://1337x.to" + link.get("href", ""),
-                "provider": "1337x"
-            })
-        except:
-            continue
-    
-    return torrents
+            return first.result()
+        except Exception as e:
+            print(f"[1337x] {primary.host} failed ({e}), falling back to {backup.host}")
+            return _fetch_from(backup, path, consume)
+
+    print(f"[1337x] {primary.host} slower than {delay:.2f}s, hedging to {backup.host}")
+    second = _hedge_executor.submit(copy_context().run, _fetch_from, backup, path, consume)
+    pending = {first, second}
+    failures = []
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                return future.result()
+            except Exception as e:
+                failures.append(e)
+    raise _combined_failure("Hedged fetch failed", failures)
+
+
+def _combined_failure(message: str, failures: list[Exception]) -> Exception:
+    """One error for several mirror failures; CookiesUnavailable if that's all they were"""
+    error_type = CookiesUnavailable if all(isinstance(e, CookiesUnavailable) for e in failures) else Exception
+    return error_type(f"{message}: {'; '.join(str(e) for e in failures)}")
+
+
+def fetch(url: str, hedge: bool = False, consume: Callable[[Iterable[str]], Any] = "".join) -> Any:
+    """Fetch a 1337x page (path or mirror URL) from the fastest healthy mirror.
+
+    Fails over to the next mirror on errors. With hedge=True, a second mirror
+    is raced against the first once it exceeds its p90 latency. The body is
+    streamed into `consume` (by default joined into the full HTML).
+    """
+    path = mirrors.to_path(url) if url.startswith("https://") else url
+    if path is None:
+        raise Exception(f"Not a 1337x mirror URL: {url}")
+    if hedge:
+        return _fetch_hedged(path, consume)
+
+    failures = []
+    ranked = mirrors.ranked()
+    # Only fail over to mirrors that already have cookies - never launch a second browser
+    candidates = [ranked[0]] + [m for m in ranked[1:] if not m.cache.needs_refresh()]
+    for mirror in candidates[:MIRROR_MAX_ATTEMPTS]:
+        try:
+            return _fetch_from(mirror, path, consume)
+        except Exception as e:
+            print(f"[1337x] {mirror.host} failed: {e}")
+            failures.append(e)
+    raise _combined_failure("All mirrors failed", failures)
+
+
+def _probe_mirrors_loop():
+    """Keep latency scores fresh and catch unreachable mirrors not currently taking traffic"""
+    while True:
+        time.sleep(MIRROR_PROBE_INTERVAL)
+        for mirror in mirrors.mirrors:
+            start = time.time()
+            try:
+                # No cookies needed: a Cloudflare challenge still proves the mirror is reachable
+                response = requests.get(mirror.url("/"), timeout=10)
+                if response.status_code >= 500 and response.status_code != 503:
+                    raise Exception(f"HTTP {response.status_code}")
+                mirror.record_probe(time.time() - start)
+            except Exception as e:
+                print(f"[1337x] Probe of {mirror.host} failed: {e}")
+                mirror.record_failure()
+
+
+def _probe_cookies(mirror: Mirror, cookies: dict, user_agent: str) -> Optional[bool]:
+    """Cheaply check whether a cookie jar still passes Cloudflare (None if unreachable)"""
+    try:
+        with requests.get(
+            mirror.url(COOKIE_PROBE_PATH),
+            cookies=cookies,
+            headers=get_browser_headers(user_agent),
+            timeout=15,
+            stream=True,
+        ) as response:
+            first = next(_stream_text(response), "")
+            return not _is_blocked(response.status_code, first)
+    except Exception as e:
+        print(f"[1337x] Cookie probe of {mirror.host} failed: {e}")
+        return None
+
+
+def _maintain_cookies(mirror: Mirror):
+    cache = mirror.cache
+    if cache._is_fetching:
+        return
+    now = time.time()
+
+    if cache.cookies and cache.fetched_at and now - max(cache.last_valid_at, cache.last_probe_at) >= COOKIE_PROBE_INTERVAL:
+        cache.last_probe_at = now
+        valid = _probe_cookies(mirror, cache.cookies, cache.user_agent)
+        if valid:
+            cache.mark_valid()
+        elif valid is False:
+            print(f"[1337x] Cookies for {mirror.host} failed validity probe")
+            cache.mark_blocked()
+            status_events.publish("blocked", mirror)
+
+    # Blocked cookies were already announced (mark_blocked zeroes fetched_at)
+    if cache.cookies and cache.fetched_at and cache.is_expired() and cache._expiry_announced != cache.fetched_at:
+        cache._expiry_announced = cache.fetched_at
+        status_events.publish("expired", mirror)
+
+    retired = cache.retired
+    if retired and now - retired["last_valid_at"] >= COOKIE_PROBE_INTERVAL:
+        age = now - retired["fetched_at"]
+        if age > COOKIE_MAX_LIFETIME or (retired["expires_at"] and now > retired["expires_at"]):
+            cache.learn_lifetime(age)
+            cache.retired = None
+        else:
+            valid = _probe_cookies(mirror, retired["cookies"], retired["user_agent"])
+            if valid:
+                retired["last_valid_at"] = now
+            elif valid is False:
+                cache.learn_lifetime(retired["last_valid_at"] - retired["fetched_at"])
+                cache.retired = None
+
+    # Refresh just ahead of expiry, but only for mirrors that are actually in use
+    if (
+        cache.cookies
+        and cache.is_expiring()
+        and now - cache.last_used_at < COOKIE_IDLE_TIMEOUT
+        and now - cache.last_refresh_at >= COOKIE_REFRESH_LEAD
+    ):
+        cache.last_refresh_at = now
+        print(f"[1337x] Cookies for {mirror.host} expire in {max(0, int(cache.expiry() - now))}s, refreshing ahead")
+        fetch_cookies_safe(mirror=mirror, force=True)
+
+
+def _cookie_maintenance_loop():
+    """Probe cookie validity, learn real lifetimes and refresh ahead of expiry"""
+    while True:
+        time.sleep(COOKIE_MAINTENANCE_INTERVAL)
+        for mirror in mirrors.mirrors:
+            try:
+                _maintain_cookies(mirror)
+            except Exception as e:
+                log_error(f"Cookie maintenance failed for {mirror.host}", e)
+
+
+def _cell_text(pieces: list[str]) -> str:
+    return "".join(piece.strip() for piece in pieces)
+
+
+def _row_to_torrent(cells: list[dict]) -> Optional[dict]:
+    """Build a torrent dict from the cells of one result row"""
+    def by_class(name: str) -> Optional[dict]:
+        return next((c for c in cells if name in c["classes"]), None)
+
+    name_col = by_class("name")
+    if not name_col:
+        return None
+
+    links = name_col["links"]
+    link = links[1] if len(links) > 1 else links[0] if links else None
+    if not link:
+        return None
+
+    seeds = by_class("seeds")
+    leeches = by_class("leeches")
+    size_col = by_class("size") or (cells[4] if len(cells) > 4 else None)
+    time_col = by_class("coll-date") or (cells[3] if len(cells) > 3 else None)
+
+    size_text = _cell_text(size_col["text"]) if size_col else "Unknown"
+    size_match = re.match(r'([\d.]+\s*[KMGT]?i?B)', size_text, re.I)
+
+    try:
+        return {
+            "title": _cell_text(link["text"]),
+            "seeds": int(_cell_text(seeds["text"])) if seeds else 0,
+            "peers": int(_cell_text(leeches["text"])) if leeches else 0,
+            "size": size_match.group(1) if size_match else size_text,
+            "time": _cell_text(time_col["text"]) if time_col else "",
+            "desc": CANONICAL_BASE + link["href"],
+            "provider": "1337x"
+        }
+    except ValueError:
+        return None
+
+
+class SearchRowParser(HTMLParser):
+    """Incremental parser for the table.table-list results table.
+
+    Feed it HTML chunks; each torrent is appended to `rows` as soon as its
+    <tr> closes, so callers can stop reading once they have enough.
+
+    HTMLParser may deliver one text node in several pieces (e.g. across feed()
+    chunks), so data is buffered and only stored as a node at the next tag.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows: deque = deque()
+        self._in_table = False
+        self._nested_tables = 0
+        self._in_tbody = False
+        self._cells: Optional[list[dict]] = None
+        self._cell: Optional[dict] = None
+        self._link: Optional[dict] = None
+        self._pending: list[str] = []
+
+    def _flush_text(self):
+        if self._pending:
+            text = "".join(self._pending)
+            self._pending = []
+            self._cell["text"].append(text)
+            if self._link is not None:
+                self._link["text"].append(text)
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+        if tag == "table":
+            if self._in_table:
+                self._nested_tables += 1
+            elif "table-list" in (dict(attrs).get("class") or "").split():
+                self._in_table = True
+            return
+        if not self._in_table or self._nested_tables:
+            return
+
+        if tag == "tbody":
+            self._in_tbody = True
+        elif tag == "tr" and self._in_tbody:
+            self._cells = []
+        elif tag == "td" and self._cells is not None:
+            self._cell = {"classes": (dict(attrs).get("class") or "").split(), "text": [], "links": []}
+            self._cells.append(self._cell)
+        elif tag == "a" and self._cell is not None:
+            self._link = {"href": dict(attrs).get("href") or "", "text": []}
+            self._cell["links"].append(self._link)
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+        if not self._in_table:
+            return
+        if tag == "table":
+            if self._nested_tables:
+                self._nested_tables -= 1
+            else:
+                self._in_table = self._in_tbody = False
+            return
+        if self._nested_tables:
+            return
+
+        if tag == "tbody":
+            self._in_tbody = False
+        elif tag == "tr" and self._cells is not None:
+            torrent = _row_to_torrent(self._cells)
+            if torrent:
+                self.rows.append(torrent)
+            self._cells = self._cell = self._link = None
+        elif tag == "td":
+            self._cell = self._link = None
+        elif tag == "a":
+            self._link = None
+
+    def handle_comment(self, data):
+        self._flush_text()
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._pending.append(data)
+
+
+def iter_search_rows(chunks: Iterable[str], limit: Optional[int] = None) -> Iterator[dict]:
+    """Yield torrents from streamed search HTML, stopping once `limit` are produced"""
+    if limit is not None and limit <= 0:
+        return
+    parser = SearchRowParser()
+    trace = _current_trace.get()
+    produced = 0
+    for chunk in chain(chunks, [None]):
+        start = time.perf_counter() if trace else 0
+        if chunk is None:
+            parser.close()
+        else:
+            parser.feed(chunk)
+        if trace:
+            trace.add("parse", time.perf_counter() - start)
+        while parser.rows:
+            yield parser.rows.popleft()
+            produced += 1
+            if limit is not None and produced >= limit:
+                return
+
+
+def parse_search(html: str, limit: Optional[int] = None) -> list[dict]:
+    """Parse search results HTML"""
+    return list(iter_search_rows([html], limit))
+
+
+# Quality scoring as described in QUALITY_SCORING.md: the first matching
+# pattern in each category contributes its points, plus a seeds bonus
+QUALITY_PATTERNS = [
+    [  # Resolution
+        (r"\b(8k|4320p)\b", 30),
+        (r"\b(4k|2160p|uhd)\b", 25),
+        (r"\b1080p\b", 20),
+        (r"\b720p\b", 12),
+        (r"\b480p\b", 6),
+        (r"\b(360p|240p)\b", 2),
+    ],
+    [  # Video codec
+        (r"\bav1\b", 15),
+        (r"\b(x265|h\.?265|hevc)\b", 12),
+        (r"\b(x264|h\.?264|avc)\b", 10),
+        (r"\b(xvid|divx)\b", 5),
+    ],
+    [  # Source
+        (r"\bremux\b", 20),
+        (r"\b(blu-?ray|bdrip|brrip)\b", 18),
+        (r"\bweb-?dl\b", 16),
+        (r"\bwebrip\b", 12),
+        (r"\bhdtv\b", 8),
+        (r"\bdvdrip\b", 6),
+    ],
+    [  # Audio
+        (r"\batmos\b", 15),
+        (r"\btruehd\b", 13),
+        (r"\bdts-?hd\b", 12),
+        (r"\bdts-?x\b", 11),
+        (r"\bdts\b", 8),
+        (r"\b(ac3|ddp?5\.?1|dolby digital)\b", 6),
+        (r"\baac\b", 4),
+        (r"\bmp3\b", 2),
+    ],
+    [  # HDR
+        (r"\b(dolby vision|dovi|dv)\b", 10),
+        (r"\bhdr10(\+|plus)", 8),
+        (r"\bhdr(10)?\b", 6),
+    ],
+]
+QUALITY_PATTERNS = [[(re.compile(p, re.I), points) for p, points in category] for category in QUALITY_PATTERNS]
+SEEDS_BONUS = [(100, 10), (50, 8), (20, 5), (10, 3), (5, 2)]
+
+
+def quality_score(title: str, seeds: int) -> int:
+    """0-100 quality score from the release name and seed count"""
+    score = 0
+    for category in QUALITY_PATTERNS:
+        score += next((points for pattern, points in category if pattern.search(title)), 0)
+    score += next((bonus for threshold, bonus in SEEDS_BONUS if seeds > threshold), 0)
+    return score
 
 
 def parse_magnet(html: str) -> tuple[Optional[str], Optional[str]]:
@@ -410,6 +1332,225 @@ def parse_magnet(html: str) -> tuple[Optional[str], Optional[str]]:
     )
 
 
+def _overloaded(reason: str, retry_after: float) -> HTTPException:
+    """503 telling the client when to come back, so it can fail over immediately"""
+    admission.shed_count += 1
+    print(f"[1337x] Shedding request: {reason} (retry after {math.ceil(retry_after)}s)")
+    return HTTPException(
+        503,
+        reason,
+        headers={
+            "Retry-After": str(max(1, math.ceil(retry_after))),
+            "X-Queue-Depth": str(admission.waiting),
+        },
+    )
+
+
+class AdmissionController:
+    """Bounded concurrency and wait queue for requests that hit the upstream.
+
+    Requests that would not get a slot before their deadline are rejected
+    up front instead of hanging until the client gives up.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.active = 0
+        self.waiting = 0
+        self.shed_count = 0
+        self.service_time: Optional[float] = None
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    def estimate_wait(self) -> float:
+        """Rough time until a newly queued request gets a slot"""
+        if self.active < self.max_concurrent:
+            return 0
+        service_time = self.service_time or ADMISSION_DEFAULT_SERVICE_TIME
+        return (self.waiting + 1) * service_time / self.max_concurrent
+
+    def _release(self, elapsed: float):
+        self.active -= 1
+        if self.service_time is None:
+            self.service_time = elapsed
+        else:
+            self.service_time = 0.2 * elapsed + 0.8 * self.service_time
+        self._semaphore.release()
+
+    async def run(self, func: Callable[[], Any], deadline: float) -> Any:
+        """Run blocking `func` in a worker thread once admitted, or raise a 503"""
+        if self.waiting >= self.max_queue:
+            raise _overloaded("Request queue is full", self.estimate_wait())
+        if time.time() + self.estimate_wait() > deadline:
+            raise _overloaded("Cannot be served before the request deadline", self.estimate_wait())
+
+        self.waiting += 1
+        try:
+            with span("queue"):
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=max(0, deadline - time.time()))
+        except asyncio.TimeoutError:
+            raise _overloaded("Timed out waiting in queue", self.estimate_wait())
+        finally:
+            self.waiting -= 1
+
+        # The slot is held until the worker thread finishes, even if we stop waiting for it
+        self.active += 1
+        start = time.time()
+        task = asyncio.ensure_future(asyncio.to_thread(func))
+
+        def on_done(t: asyncio.Future):
+            if not t.cancelled():
+                t.exception()  # mark as retrieved if nobody awaited it
+            self._release(time.time() - start)
+
+        task.add_done_callback(on_done)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout=max(0, deadline - time.time()))
+        except asyncio.TimeoutError:
+            raise _overloaded("Request deadline exceeded", self.estimate_wait())
+
+    def get_status(self) -> dict:
+        return {
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "shed_total": self.shed_count,
+            "service_time_ms": int(self.service_time * 1000) if self.service_time is not None else None,
+        }
+
+
+admission = AdmissionController(ADMISSION_MAX_CONCURRENT, ADMISSION_MAX_QUEUE)
+
+
+def request_deadline(request: Request) -> float:
+    """Absolute deadline from the client's X-Deadline-Ms budget (capped at the default)"""
+    budget = ADMISSION_DEFAULT_DEADLINE
+    try:
+        budget = min(budget, int(request.headers.get("X-Deadline-Ms", "")) / 1000)
+    except ValueError:
+        pass
+    return time.time() + budget
+
+
+def refresh_retry_after() -> float:
+    """Seconds until the cookie refresh in progress should land (a full refresh if none is)"""
+    refresh_time = expected_refresh_time()
+    fetching = [m.cache for m in mirrors.mirrors if m.cache._is_fetching]
+    if not fetching:
+        return refresh_time
+    return max(1, min(c._fetch_started_at for c in fetching) + refresh_time - time.time())
+
+
+def check_upstream_ready(deadline: float):
+    """Shed straight away if no mirror can have usable cookies before the deadline.
+
+    A cold request whose deadline leaves room for a typical refresh is
+    admitted and refreshes inline; concurrent callers are shed until it lands.
+    """
+    if any(not m.cache.needs_refresh() for m in mirrors.ranked()):
+        return
+    refresh_time = expected_refresh_time()
+    if any(m.cache._is_fetching for m in mirrors.mirrors):
+        raise _overloaded("Cloudflare cookie refresh in progress", refresh_retry_after())
+    if deadline - time.time() < refresh_time:
+        # Too little time to solve the challenge inline - start it for the next caller
+        threading.Thread(target=fetch_cookies_safe, daemon=True).start()
+        raise _overloaded("Cloudflare cookies unavailable, refresh started", refresh_time)
+
+
+class BrowseCache:
+    """Top/trending listings, refreshed in the background and snapshotted to disk"""
+
+    def __init__(self, snapshot_file: str):
+        self.snapshot_file = snapshot_file
+        self.listings: dict[str, dict] = {}  # name -> {"torrents": [...], "updated_at": ts}
+        self._load_snapshot()
+
+    def _load_snapshot(self):
+        try:
+            if os.path.exists(self.snapshot_file):
+                with open(self.snapshot_file, "r") as f:
+                    self.listings = json.load(f)
+                print(f"[1337x] Loaded {len(self.listings)} browse listings from snapshot")
+        except Exception as e:
+            print(f"[1337x] Failed to load browse snapshot: {e}")
+
+    def _save_snapshot(self):
+        try:
+            tmp_file = self.snapshot_file + ".tmp"
+            with open(tmp_file, "w") as f:
+                json.dump(self.listings, f)
+            os.replace(tmp_file, self.snapshot_file)
+        except Exception as e:
+            print(f"[1337x] Failed to save browse snapshot: {e}")
+
+    def oldest_update(self) -> float:
+        """Oldest refresh time across all listings (0 if any has never loaded)"""
+        return min((self.listings.get(name, {}).get("updated_at", 0) for name in BROWSE_LISTINGS), default=0)
+
+    def refresh(self) -> bool:
+        """Scrape every listing from mirrors that already have cookies. Returns True if all succeeded.
+
+        Never launches a browser: the round stops as soon as cookies are unavailable.
+        """
+        ok = True
+        for name, path in BROWSE_LISTINGS.items():
+            mirror = next((m for m in mirrors.ranked() if not m.cache.needs_refresh()), None)
+            if mirror is None:
+                print("[1337x] Stopping browse refresh: no valid cookies")
+                ok = False
+                break
+            try:
+                torrents = _fetch_from(
+                    mirror, path, consume=lambda chunks: list(iter_search_rows(chunks)), refresh_cookies=False
+                )
+                if not torrents:
+                    raise Exception("No rows parsed")
+                for torrent in torrents:
+                    torrent["score"] = quality_score(torrent["title"], torrent["seeds"])
+                # Swap in a new dict so readers never see a half-built listing
+                self.listings = {**self.listings, name: {"torrents": torrents, "updated_at": time.time()}}
+            except CookiesUnavailable as e:
+                print(f"[1337x] Stopping browse refresh: {e}")
+                ok = False
+                break
+            except Exception as e:
+                ok = False
+                log_error(f"Browse listing refresh failed: {name}", e)
+        self._save_snapshot()
+        print(f"[1337x] Browse listings refreshed ({'complete' if ok else 'partial'})")
+        return ok
+
+
+browse_cache = BrowseCache(BROWSE_SNAPSHOT_FILE)
+
+
+def _browse_refresh_loop():
+    """Refresh Browse listings on a schedule, paying for at most one browser launch per round"""
+    time.sleep(BROWSE_STARTUP_DELAY)
+    while True:
+        if any(m.cache._is_fetching for m in mirrors.mirrors):
+            # Warmup or real traffic is already solving the challenge - don't race it
+            print("[1337x] Skipping browse refresh: cookie refresh in progress")
+            time.sleep(BROWSE_RETRY_INTERVAL)
+            continue
+        if all(m.cache.needs_refresh() for m in mirrors.mirrors):
+            # Ride on cookies fetched for real traffic; only pay for a browser when very stale
+            stale = time.time() - browse_cache.oldest_update() > BROWSE_MAX_STALENESS
+            if not stale:
+                print("[1337x] Skipping browse refresh: no valid cookies")
+                time.sleep(BROWSE_RETRY_INTERVAL)
+                continue
+            if not fetch_cookies_safe():
+                # Don't keep launching browsers for Browse alone while Cloudflare wins
+                print("[1337x] Skipping browse refresh: cookie refresh failed")
+                time.sleep(BROWSE_REFRESH_INTERVAL)
+                continue
+        ok = browse_cache.refresh()
+        time.sleep(BROWSE_REFRESH_INTERVAL if ok else BROWSE_RETRY_INTERVAL)
+
+
 # Models
 class Torrent(BaseModel):
     title: str
@@ -424,6 +1565,15 @@ class SearchResponse(BaseModel):
     torrents: list[Torrent]
     error: Optional[str] = None
 
+class ScoredTorrent(Torrent):
+    score: int
+
+class BrowseResponse(BaseModel):
+    listing: str
+    torrents: list[ScoredTorrent]
+    updated_at: Optional[float] = None
+    error: Optional[str] = None
+
 class MagnetResponse(BaseModel):
     magnet: str
     title: Optional[str] = None
@@ -432,12 +1582,13 @@ class WarmupResponse(BaseModel):
     status: str
     cookies_valid: bool
     message: str
+    mirror: Optional[str] = None  # host whose cookies are being warmed
 
 
 # Endpoints
 @app.get("/")
 async def root():
-    status = cache.get_status()
+    status = mirrors.get_status()
     return {
         "status": "ok",
         "cookies": status
@@ -450,14 +1601,16 @@ async def warmup(background_tasks: BackgroundTasks, force: bool = False):
     Warmup endpoint - preload Cloudflare cookies.
     Call this on app startup to ensure cookies are ready.
     """
-    status = cache.get_status()
+    mirror = mirrors.best()
+    status = mirror.cache.get_status()
     
     # If already fetching, just return status
     if status["is_fetching"]:
         return WarmupResponse(
             status="in_progress",
             cookies_valid=status["valid"],
-            message="Cookie fetch already in progress"
+            message="Cookie fetch already in progress",
+            mirror=mirror.host
         )
     
     # If cookies are valid and not forcing, return early
@@ -465,70 +1618,193 @@ async def warmup(background_tasks: BackgroundTasks, force: bool = False):
         return WarmupResponse(
             status="ready",
             cookies_valid=True,
-            message=f"Cookies already valid (TTL remaining: {status['ttl_remaining']}s)"
+            message=f"Cookies already valid (TTL remaining: {status['ttl_remaining']}s)",
+            mirror=mirror.host
         )
     
-    # Start cookie fetch in background
-    def fetch_in_background():
-        fetch_cookies_safe()
-    
-    background_tasks.add_task(fetch_in_background)
+    # Claim the fetch before responding, so a status stream opened right
+    # after this call already sees is_fetching; the browser runs in background
+    claimed = _claim_fetch(mirror.cache, force)
+    if claimed is not None:
+        return WarmupResponse(
+            status="ready" if claimed else "in_progress",
+            cookies_valid=claimed,
+            message="Cookies already valid" if claimed else "Cookie fetch already in progress",
+            mirror=mirror.host
+        )
+    background_tasks.add_task(_run_cookie_fetch, mirror)
     
     return WarmupResponse(
         status="warming_up",
         cookies_valid=False,
-        message="Cookie fetch started in background"
+        message="Cookie fetch started in background",
+        mirror=mirror.host
     )
 
 
 @app.get("/api/status")
 async def status():
     """Get detailed cookie status"""
-    return cache.get_status()
+    return {**mirrors.get_status(), "admission": admission.get_status()}
+
+
+@app.get("/api/browse", response_model=BrowseResponse)
+async def browse(
+    listing: str = Query("top"),
+    sort: str = Query("rank", pattern="^(rank|score|seeds)$"),
+    limit: int = Query(100, ge=1, le=100),
+):
+    """Precomputed top/trending listings, served from memory (never hits upstream)"""
+    if listing not in BROWSE_LISTINGS:
+        raise HTTPException(404, f"Unknown listing, expected one of: {', '.join(BROWSE_LISTINGS)}")
+    entry = browse_cache.listings.get(listing)
+    if not entry:
+        return BrowseResponse(listing=listing, torrents=[], error="Listing not loaded yet")
+
+    torrents = entry["torrents"]
+    if sort != "rank":
+        torrents = sorted(torrents, key=lambda t: t[sort], reverse=True)
+    return BrowseResponse(listing=listing, torrents=torrents[:limit], updated_at=entry["updated_at"])
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.get("/api/status/stream")
+async def status_stream():
+    """Server-Sent Events stream of cookie state transitions.
+
+    Starts with a `snapshot` event, then pushes fetching, attempt_failed,
+    valid, failed, blocked and expired as they happen. Each event carries
+    the overall status in the same shape as /api/status.
+    """
+    subscriber = status_events.subscribe()
+
+    async def events():
+        try:
+            yield _sse("snapshot", {"state": "snapshot", "status": overall_status()})
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber[1].get(), timeout=STATUS_STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse(event["state"], event)
+        finally:
+            status_events.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.get("/api/search", response_model=SearchResponse)
-async def search(query: str = Query(..., min_length=2), limit: int = Query(50)):
-    """Search 1337x.to"""
-    try:
-        # Ensure cookies are available before attempting search
-        if not ensure_cookies():
-            print(f"[1337x] Search failed: Could not get Cloudflare cookies")
-            return SearchResponse(torrents=[], error="Failed to bypass Cloudflare. Please try again later.")
-        
-        print(f"[1337x] Searching for query: {query}")
-        url = f"https://1337x.to/search/{query.replace(' ', '+')}/1/"
-        html = fetch(url)
-        torrents = parse_search(html)
-        return SearchResponse(torrents=[Torrent(**t) for t in torrents[:limit]])
-    except Exception as e:
-        log_error(f"Search failed for query: {query}", e)
-        error_msg = str(e)
-        # Return empty results instead of 500 error - 1337x is optional
-        return SearchResponse(torrents=[], error=f"Search failed: {error_msg}")
+async def search(
+    request: Request,
+    response: Response,
+    query: str = Query(..., min_length=2),
+    limit: int = Query(50),
+    hedge: bool = Query(False),
+):
+    """Search 1337x (hedge=true races a second mirror when the first is slow).
+
+    Returns 503 with Retry-After when the request can't be served before its
+    deadline (X-Deadline-Ms header), so callers can move on immediately.
+    """
+    deadline = request_deadline(request)
+    check_upstream_ready(deadline)
+
+    def run_search() -> SearchResponse:
+        try:
+            print(f"[1337x] Searching for query: {query}")
+            # Rows are parsed as the page streams in; reading stops at `limit`
+            torrents = fetch(
+                f"/search/{query.replace(' ', '+')}/1/",
+                hedge=hedge,
+                consume=lambda chunks: list(iter_search_rows(chunks, limit)),
+            )
+            with span("serialize"):
+                return SearchResponse(torrents=[Torrent(**t) for t in torrents])
+        except CookiesUnavailable as e:
+            # Cookies went bad after admission (refresh in progress or failed): tell the client when to retry
+            raise _overloaded(f"Cloudflare cookies unavailable: {e}", refresh_retry_after())
+        except Exception as e:
+            log_error(f"Search failed for query: {query}", e)
+            error_msg = str(e)
+            # Return empty results instead of 500 error - 1337x is optional
+            return SearchResponse(torrents=[], error=f"Search failed: {error_msg}")
+
+    result = await admission.run(run_search, deadline)
+    response.headers["X-Queue-Depth"] = str(admission.waiting)
+    return result
 
 
 @app.get("/api/magnet", response_model=MagnetResponse)
-async def magnet(url: str = Query(...)):
+async def magnet(request: Request, url: str = Query(...)):
     """Get magnet from detail page"""
-    if not url.startswith("https://1337x.to/"):
+    path = mirrors.to_path(url)
+    if path is None:
         raise HTTPException(400, "Invalid URL")
+    deadline = request_deadline(request)
+    check_upstream_ready(deadline)
+
+    def run_magnet() -> MagnetResponse:
+        try:
+            html = fetch(path)
+            with span("parse"):
+                mag, title = parse_magnet(html)
+            if not mag:
+                raise HTTPException(404, "Magnet not found")
+            return MagnetResponse(magnet=mag, title=title)
+        except HTTPException:
+            raise
+        except CookiesUnavailable as e:
+            raise _overloaded(f"Cloudflare cookies unavailable: {e}", refresh_retry_after())
+        except Exception as e:
+            log_error(f"Magnet fetch failed for URL: {url}", e)
+            raise HTTPException(500, str(e))
+
+    return await admission.run(run_magnet, deadline)
+
+
+def require_debug(request: Request):
+    """Debug endpoints 404 unless LEET_DEBUG_TOKEN is set, and 403 without it"""
+    if not DEBUG_TOKEN:
+        raise HTTPException(404, "Not Found")
+    if not debug_authorized(request.headers.get("X-Debug-Token", "")):
+        raise HTTPException(403, "Invalid debug token")
+
+
+@app.get("/debug/profile", include_in_schema=False)
+async def debug_profile(
+    request: Request,
+    seconds: float = Query(10, gt=0, le=PROFILE_MAX_SECONDS),
+    mode: str = Query("wall", pattern="^(wall|cpu)$"),
+    interval_ms: int = Query(10, ge=1, le=1000),
+):
+    """Sample the live process and return collapsed stacks for a flamegraph"""
+    require_debug(request)
+    if not _profile_lock.acquire(blocking=False):
+        raise HTTPException(409, "A profile is already running")
     try:
-        html = fetch(url)
-        mag, title = parse_magnet(html)
-        if not mag:
-            raise HTTPException(404, "Magnet not found")
-        return MagnetResponse(magnet=mag, title=title)
-    except HTTPException:
-        raise
-    except Exception as e:
-        log_error(f"Magnet fetch failed for URL: {url}", e)
-        raise HTTPException(500, str(e))
+        folded = await asyncio.to_thread(sample_stacks, seconds, interval_ms / 1000, mode)
+    finally:
+        _profile_lock.release()
+    return PlainTextResponse(
+        folded,
+        headers={"Content-Disposition": f'attachment; filename="1337x-{mode}-{int(time.time())}.folded"'},
+    )
 
 
 if __name__ == "__main__":
     print(f"Starting 1337x API on http://localhost:8000")
-    print(f"Cookie TTL: {COOKIE_TTL}s ({COOKIE_TTL//60} minutes)")
-    print(f"Cookie cache file: {COOKIE_CACHE_FILE}")
+    print(f"Default cookie TTL: {COOKIE_TTL}s ({COOKIE_TTL//60} minutes), adapted from observed expiry")
+    print(f"Mirrors: {', '.join(MIRRORS)}")
+    print(f"Cookie cache dir: {COOKIE_CACHE_DIR}")
     print(f"Error logs: {ERROR_LOG_DIR}")
+    print(f"Browse snapshot: {BROWSE_SNAPSHOT_FILE}")
+    print(f"Debug endpoints: {'enabled' if DEBUG_TOKEN else 'disabled'}")
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -21,43 +21,42 @@ export function isWarmupActive(): boolean {
   return currentWarmupStatus === "warming_up" || currentWarmupStatus === "idle";
 }
 
+/** Update the shared warmup state and wake anyone waiting once it settles */
+function setWarmupStatus(status: WarmupStatus["status"]): void {
+  currentWarmupStatus = status;
+  if (status === "ready" || status === "error") {
+    const resolvers = warmupReadyResolvers;
+    warmupReadyResolvers = [];
+    resolvers.forEach((resolve) => resolve());
+  }
+}
+
 /**
  * Wait for warmup to complete (resolves immediately if already ready/error).
  * Returns true if 1337x is ready, false if error/timeout.
- * Polls /api/1337x/status as fallback with a timeout.
+ * Resolved by the CloudflareStatus component as soon as its warmup stream settles.
  */
-export async function waitForWarmup(timeoutMs = 60000): Promise<boolean> {
-  if (currentWarmupStatus === "ready") return true;
-  if (currentWarmupStatus === "error") return false;
-
-  // Poll the server status endpoint
-  const pollInterval = 2000;
-  const maxAttempts = Math.ceil(timeoutMs / pollInterval);
-
-  for (let i = 0; i < maxAttempts; i++) {
-    // Check local state first (updated by the CloudflareStatus component)
-    if (currentWarmupStatus === "ready") return true;
-    if (currentWarmupStatus === "error") return false;
-
-    try {
-      const res = await fetch("/api/1337x/status");
-      const data = await res.json();
-      if (data.valid) return true;
-      if (!data.is_fetching && !data.warmup_in_progress && !data.valid) return false;
-    } catch {
-      // Server not reachable, keep polling
-    }
-
-    await new Promise((r) => setTimeout(r, pollInterval));
-  }
-
-  return false; // Timed out
+export function waitForWarmup(timeoutMs = 60000): Promise<boolean> {
+  if (currentWarmupStatus === "ready") return Promise.resolve(true);
+  if (currentWarmupStatus === "error") return Promise.resolve(false);
+
+  return new Promise((resolve) => {
+    const onSettled = () => {
+      clearTimeout(timer);
+      resolve(currentWarmupStatus === "ready");
+    };
+    const timer = setTimeout(() => {
+      warmupReadyResolvers = warmupReadyResolvers.filter((r) => r !== onSettled);
+      resolve(false); // Timed out
+    }, timeoutMs);
+    warmupReadyResolvers.push(onSettled);
+  });
 }
 
 const TOOLTIP_TEXT = `1337x.to uses Cloudflare bot protection.
 This indicator shows the connection status.
 When warming up, a browser opens briefly to bypass Cloudflare.
-Cookies are cached for 30 minutes.`;
+Cookies are refreshed automatically before they expire.`;
 
 export function CloudflareStatus({ onReady }: CloudflareStatusProps) {
   const [status, setStatus] = useState<WarmupStatus>({
@@ -81,7 +80,7 @@ export function CloudflareStatus({ onReady }: CloudflareStatusProps) {
       try {
         const data: WarmupStatus = JSON.parse(event.data);
         setStatus(data);
-        currentWarmupStatus = data.status;
+        setWarmupStatus(data.status);
 
         if (data.status === "ready") {
           onReady?.();
@@ -99,7 +98,7 @@ export function CloudflareStatus({ onReady }: CloudflareStatusProps) {
       eventSource.close();
       setStatus((prev) => {
         if (prev.status !== "ready") {
-          currentWarmupStatus = "error";
+          setWarmupStatus("error");
           return {
             status: "error",
             message: "Connection failed",
@@ -20,6 +20,13 @@ interface SearchResponse {
   error?: string;
 }
 
+export interface BrowseListing {
+  listing: string;
+  torrents: (Torrent1337x & { score: number })[];
+  updated_at?: number;
+  error?: string;
+}
+
 interface MagnetResponse {
   magnet: string;
   title?: string;
@@ -33,11 +40,39 @@ export interface WarmupStatus {
   cookiesValid?: boolean;
 }
 
+// While the API is shedding load (503 + Retry-After), skip it until this time
+let unavailableUntil = 0;
+
+/**
+ * Record a 503 from the API so callers fail over to other providers immediately
+ */
+function markUnavailable(response: Response): void {
+  const retryAfter = parseInt(response.headers.get("Retry-After") || "", 10) || 5;
+  unavailableUntil = Date.now() + retryAfter * 1000;
+  const queueDepth = response.headers.get("X-Queue-Depth") ?? "?";
+  console.log(`[1337x] API overloaded (queue depth ${queueDepth}), skipping for ${retryAfter}s`);
+}
+
 interface APIStatusResponse {
   valid: boolean;
   age_seconds?: number;
   ttl_remaining?: number;
   is_fetching?: boolean;
+  mirror?: string;
+  admission?: {
+    active: number;
+    queue_depth: number;
+    shed_total: number;
+  };
+}
+
+export interface StatusEvent {
+  state: "snapshot" | "fetching" | "attempt_failed" | "valid" | "failed" | "blocked" | "expired";
+  host?: string;
+  attempt?: number;
+  max_attempts?: number;
+  error?: string;
+  status: APIStatusResponse;
 }
 
 /**
@@ -55,15 +90,27 @@ export async function isAvailable(): Promise<boolean> {
 }
 
 /**
- * Search 1337x.to for torrents
+ * Search 1337x for torrents
+ * Interactive searches should pass hedge=true so a slow mirror is raced against a second one
  */
-export async function search(query: string, limit = 50): Promise<Torrent1337x[]> {
+export async function search(query: string, limit = 50, hedge = false): Promise<Torrent1337x[]> {
+  if (Date.now() < unavailableUntil) {
+    return [];
+  }
+
   try {
-    const url = `${API_URL}/api/search?query=${encodeURIComponent(query)}&limit=${limit}`;
+    const timeoutMs = 45_000; // 45s timeout for first request (may need to fetch cookies)
+    const url = `${API_URL}/api/search?query=${encodeURIComponent(query)}&limit=${limit}&hedge=${hedge}`;
     const response = await fetch(url, {
-      signal: AbortSignal.timeout(45_000) // 45s timeout for first request (may need to fetch cookies)
+      headers: { "X-Deadline-Ms": String(timeoutMs) },
+      signal: AbortSignal.timeout(timeoutMs)
     });
 
+    if (response.status === 503) {
+      markUnavailable(response);
+      return [];
+    }
+
     if (!response.ok) {
       console.error(`[1337x] Search failed: ${response.status}`);
       return [];
@@ -83,14 +130,42 @@ export async function search(query: string, limit = 50): Promise<Torrent1337x[]>
   }
 }
 
+/**
+ * Get a precomputed top/trending listing (served from the API's memory, no upstream fetch)
+ */
+export async function browse(
+  listing = "top",
+  sort: "rank" | "score" | "seeds" = "rank",
+  limit = 100
+): Promise<BrowseListing> {
+  try {
+    const url = `${API_URL}/api/browse?listing=${encodeURIComponent(listing)}&sort=${sort}&limit=${limit}`;
+    const response = await fetch(url, {
+      signal: AbortSignal.timeout(5_000)
+    });
+
+    if (!response.ok) {
+      console.error(`[1337x] Browse failed: ${response.status}`);
+      return { listing, torrents: [], error: `Browse failed: ${response.status}` };
+    }
+
+    return await response.json();
+  } catch (error) {
+    console.error("[1337x] Browse error:", error);
+    return { listing, torrents: [], error: "1337x API not available" };
+  }
+}
+
 /**
  * Get magnet link for a 1337x torrent
  */
 export async function getMagnet(torrentUrl: string): Promise<string | null> {
   try {
+    const timeoutMs = 30_000;
     const url = `${API_URL}/api/magnet?url=${encodeURIComponent(torrentUrl)}`;
     const response = await fetch(url, {
-      signal: AbortSignal.timeout(30000)
+      headers: { "X-Deadline-Ms": String(timeoutMs) },
+      signal: AbortSignal.timeout(timeoutMs)
     });
 
     if (!response.ok) {
@@ -135,6 +210,7 @@ async function triggerWarmup(): Promise<{
   status: string;
   cookies_valid: boolean;
   message: string;
+  mirror?: string;
 }> {
   const response = await fetch(`${API_URL}/api/warmup`, {
     method: "POST",
@@ -144,32 +220,86 @@ async function triggerWarmup(): Promise<{
 }
 
 /**
- * Wait for cookies to become valid by polling the status endpoint
+ * Subscribe to cookie state transitions pushed by the Python API (Server-Sent Events)
+ * Calls onEvent for every event until it returns true, the stream ends or the signal aborts
  */
-async function waitForCookies(timeoutMs = 60_000): Promise<boolean> {
-  const pollInterval = 2000; // Check every 2 seconds
-  const maxAttempts = Math.ceil(timeoutMs / pollInterval);
-
-  for (let i = 0; i < maxAttempts; i++) {
-    const status = await getStatus();
+export async function subscribeStatus(
+  onEvent: (event: StatusEvent) => boolean | void,
+  signal: AbortSignal
+): Promise<void> {
+  const response = await fetch(`${API_URL}/api/status/stream`, {
+    headers: { Accept: "text/event-stream" },
+    signal
+  });
+  if (!response.ok || !response.body) {
+    throw new Error(`Status stream failed: ${response.status}`);
+  }
 
-    if (status.valid) {
-      console.log("[1337x] Cookies are now valid");
-      return true;
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+  try {
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) return;
+      buffer += value;
+
+      // Events are separated by a blank line; keepalive comments carry no data
+      let boundary: number;
+      while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+        const block = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        const data = block
+          .split("\n")
+          .filter((line) => line.startsWith("data:"))
+          .map((line) => line.slice(5).trim())
+          .join("\n");
+        if (data && onEvent(JSON.parse(data)) === true) return;
+      }
     }
+  } finally {
+    reader.cancel().catch(() => {});
+  }
+}
 
-    if (!status.is_fetching && !status.valid) {
-      // Not fetching and not valid means fetch failed
-      console.log("[1337x] Cookie fetch completed but cookies are invalid");
-      return false;
-    }
+/**
+ * Wait for the warmup of `host` to finish, reacting to pushed status events
+ * Events about other mirrors are ignored; a snapshot showing `host` idle
+ * without valid cookies means its fetch already ended before we subscribed
+ */
+async function waitForCookies(
+  host: string | undefined,
+  timeoutMs = 60_000,
+  onEvent?: (event: StatusEvent) => void
+): Promise<boolean> {
+  let valid = false;
+
+  try {
+    await subscribeStatus((event) => {
+      const eventHost = event.state === "snapshot" ? event.status.mirror : event.host;
+      if (host && eventHost !== host) return;
+
+      onEvent?.(event);
 
-    // Still fetching, wait and try again
-    await sleep(pollInterval);
+      if (event.status.valid) {
+        console.log("[1337x] Cookies are now valid");
+        valid = true;
+        return true;
+      }
+
+      if (event.state === "failed" || (event.state === "snapshot" && !event.status.is_fetching)) {
+        console.log("[1337x] Cookie fetch completed but cookies are invalid");
+        return true;
+      }
+    }, AbortSignal.timeout(timeoutMs));
+  } catch (error) {
+    if (error instanceof Error && error.name === "TimeoutError") {
+      console.log("[1337x] Timed out waiting for cookies");
+    } else {
+      console.error("[1337x] Status stream error:", error);
+    }
   }
 
-  console.log("[1337x] Timed out waiting for cookies");
-  return false;
+  return valid;
 }
 
 // Singleton to prevent concurrent warmup requests
@@ -252,7 +382,17 @@ async function doWarmupWithRetry(
 
       // Wait for the background cookie fetch to complete
       // Python side has 45s hard timeout per attempt with 2 retries, so allow up to 120s
-      const success = await waitForCookies(120_000);
+      const success = await waitForCookies(warmupResult.mirror, 120_000, (event) => {
+        if (event.state === "attempt_failed") {
+          onStatusUpdate?.({
+            status: "warming_up",
+            message: `Browser attempt ${event.attempt}/${event.max_attempts} failed, retrying...`,
+            attempt,
+            maxAttempts,
+            cookiesValid: false
+          });
+        }
+      });
 
       if (success) {
         const result: WarmupStatus = {
@@ -99,7 +99,7 @@ app.get("/api/search", async (c) => {
 
     if (search1337x) {
       promises.push(
-        leet.search(name, resultLimit).catch((err) => {
+        leet.search(name, resultLimit, true).catch((err) => {
           console.error("1337x search error:", err);
           return [];
         })
@@ -220,6 +220,17 @@ app.get("/api/1337x/status", async (c) => {
   });
 });
 
+// 1337x top/trending listings for the Browse page
+app.get("/api/1337x/browse", async (c) => {
+  const { listing, sort, limit } = c.req.query();
+  const data = await leet.browse(
+    listing || "top",
+    sort === "score" || sort === "seeds" ? sort : "rank",
+    limit ? parseInt(limit) : 100
+  );
+  return c.json(data);
+});
+
 // Get magnet link
 app.post("/api/magnet", async (c) => {
   const torrent = await c.req.json();